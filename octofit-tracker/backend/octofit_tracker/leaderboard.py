@@ -0,0 +1,21 @@
+"""
+Snapshot precomputado do leaderboard por time.
+
+A tabela Leaderboard guarda os pontos de cada time: as leituras da API
+consultam apenas essa tabela e ``refresh_leaderboards`` recalcula os totais a
+partir das atividades (via ``manage.py refresh_leaderboard`` ou ``populate_db``).
+"""
+from django.db import transaction
+from django.db.models import Sum
+from .models import Team, Leaderboard
+
+
+@transaction.atomic
+def refresh_leaderboards():
+    """Recalcula o snapshot de Leaderboard com uma única agregação por time."""
+    # pontos = soma de calories (arredondada) dos membros, GROUP BY team
+    teams = Team.objects.annotate(total=Sum('members__activity__calories_burned'))
+    snapshot = [Leaderboard(team=team, total_points=int(team.total or 0)) for team in teams]
+    Leaderboard.objects.all().delete()
+    Leaderboard.objects.bulk_create(snapshot)
+    return len(snapshot)
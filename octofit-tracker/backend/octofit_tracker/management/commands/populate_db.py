@@ -4,12 +4,96 @@ Django management command to populate the octofit_db database with test data.
 Usage:
   python manage.py populate_db          # popula apenas se não houver dados
   python manage.py populate_db --force  # apaga dados existentes e popula novamente
+  python manage.py populate_db --force --activities-per-user 300  # seed maior (teste de carga)
+
+Com a variável de ambiente POPULATE_USE_RAW_SQL definida, os inserts em massa
+são feitos com ``cursor.executemany`` em vez do ORM (apenas backends SQL).
 """
-from django.core.management.base import BaseCommand
-from django.db import transaction
-from django.db.models import Sum
-from datetime import datetime, timedelta
+import os
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
 from octofit_tracker.models import User, Team, Activity, Leaderboard, Workout
+from octofit_tracker.leaderboard import refresh_leaderboards
+
+# tabelas through das relações M2M, resolvidas uma vez no import (o app
+# registry já está carregado quando o management command é importado)
+TEAM_MEMBERS_THROUGH = Team.members.through
+WORKOUT_SUGGESTED_THROUGH = Workout.suggested_for.through
+
+# ordem de dependência para o reset: activities e tabelas through antes de
+# workouts/teams, e usuários por último
+RESET_ORDER = [
+    Activity,
+    WORKOUT_SUGGESTED_THROUGH,
+    Workout,
+    Leaderboard,
+    TEAM_MEMBERS_THROUGH,
+    Team,
+    User,
+]
+
+
+def bulk_insert(model, fields, rows, raw_sql=False):
+    """Insere ``rows`` (tuplas na ordem de ``fields``) na tabela de ``model``.
+
+    Com ``raw_sql`` usa ``cursor.executemany`` direto, sem instanciar models nem
+    disparar signals; caso contrário usa ``bulk_create``. Campos FK recebem a PK.
+    Campos ``auto_now``/``auto_now_add`` recebem o valor do ``pre_save`` nos dois
+    caminhos, como o ORM faria. Retorna as instâncias criadas pelo
+    ``bulk_create`` (``None`` no caminho raw).
+    """
+    model_fields = [model._meta.get_field(name) for name in fields]
+    if not raw_sql:
+        return model.objects.bulk_create(
+            [model(**{f.attname: v for f, v in zip(model_fields, row)}) for row in rows],
+            batch_size=500,
+        )
+
+    # mesmo timestamp que o pre_save do ORM aplicaria em cada instância
+    stamp = model()
+    auto_values = {
+        f.name: f.pre_save(stamp, add=True)
+        for f in model._meta.concrete_fields
+        if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)
+    }
+    extra_fields = [
+        f for f in model._meta.concrete_fields if f.name in auto_values and f.name not in fields
+    ]
+    columns = model_fields + extra_fields
+
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(f.column) for f in columns),
+        ', '.join(['%s'] * len(columns)),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            [
+                f.get_db_prep_save(auto_values.get(f.name, v), connection)
+                for f, v in zip(columns, [*row, *(auto_values[f.name] for f in extra_fields)])
+            ]
+            for row in rows
+        ])
+    return None
+
+
+def build_activity_rows(user_ids, per_user):
+    """Gera as tuplas (user_id, duration, calories, type) das atividades demo.
+
+    ``Activity.date`` é ``auto_now_add``, então a data fica a cargo do insert.
+    """
+    return [
+        (
+            user_id,
+            20 + i * 10 + j * 5,
+            float(150 + i * 30 + j * 20),
+            'run' if j % 2 == 0 else 'bike',
+        )
+        for i, user_id in enumerate(user_ids)
+        for j in range(per_user)
+    ]
 
 
 class Command(BaseCommand):
@@ -21,13 +105,23 @@ class Command(BaseCommand):
             action='store_true',
             help='Apaga dados existentes antes de popular',
         )
+        parser.add_argument(
+            '--activities-per-user',
+            type=int,
+            default=3,
+            help='Quantidade de atividades geradas por usuário',
+        )
 
     def handle(self, *args, **options):
         force = options.get('force', False)
+        activities_per_user = options.get('activities_per_user', 3)
+        # validar antes do reset, para não deixar o banco vazio com --force
+        if activities_per_user < 1:
+            raise CommandError('--activities-per-user deve ser maior ou igual a 1.')
 
         if force:
             self.reset_data()
-            self.create_demo_data()
+            self.create_demo_data(activities_per_user)
         else:
             # se já houver usuários, não duplicar
             if User.objects.exists():
@@ -39,57 +133,36 @@ class Command(BaseCommand):
                 )
                 return
 
-            self.create_demo_data()
+            self.create_demo_data(activities_per_user)
 
     def reset_data(self):
-        self.stdout.write('Removendo dados existentes (limpando M2M explicitamente)...')
+        # as sequências de PK não são reiniciadas (em nenhum backend): não
+        # dependa de IDs fixos para os dados demo
+        self.stdout.write('Removendo dados existentes...')
         try:
             with transaction.atomic():
-                # apagar activities primeiro (dependem de user)
-                Activity.objects.all().delete()
-
-                # limpar relações M2M de workouts antes de deletar (usar tabela through)
-                try:
-                    through_w = Workout.suggested_for.through
-                    through_w.objects.all().delete()
-                except Exception:
-                    # fallback: tentar limpar via instâncias
-                    for w in Workout.objects.all():
-                        try:
-                            w.suggested_for.clear()
-                        except Exception:
-                            pass
-                # deletar workouts
-                Workout.objects.all().delete()
-
-                # deletar leaderboards
-                Leaderboard.objects.all().delete()
-
-                # limpar relações M2M de teams antes de deletar (usar tabela through)
-                try:
-                    through_t = Team.members.through
-                    through_t.objects.all().delete()
-                except Exception:
-                    # fallback: tentar limpar via instâncias
-                    for t in Team.objects.all():
-                        try:
-                            t.members.clear()
-                        except Exception:
-                            pass
-                # deletar teams
-                Team.objects.all().delete()
-
-                # por fim, deletar usuários
-                User.objects.all().delete()
+                if connection.vendor == 'postgresql':
+                    tables = ', '.join(
+                        connection.ops.quote_name(model._meta.db_table) for model in RESET_ORDER
+                    )
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'TRUNCATE TABLE {tables} CASCADE')
+                else:
+                    # sem TRUNCATE: DELETE direto, sem carregar PKs nem disparar signals
+                    for model in RESET_ORDER:
+                        model.objects.all()._raw_delete(using=connection.alias)
 
             self.stdout.write(self.style.SUCCESS('Dados removidos com sucesso.'))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Erro ao remover dados: {e}'))
             raise
 
-    def create_demo_data(self):
+    @transaction.atomic
+    def create_demo_data(self, activities_per_user=3):
+        # todos os inserts são confirmados em um único commit
+        raw_sql = bool(os.environ.get('POPULATE_USE_RAW_SQL'))
+
         self.stdout.write('Criando usuários...')
-        users = []
         demo_users = [
             ('alice', 'alice@example.com', 'Alice', 'Silva'),
             ('bob', 'bob@example.com', 'Bob', 'Souza'),
@@ -97,64 +170,59 @@ class Command(BaseCommand):
             ('dave', 'dave@example.com', 'Dave', 'Oliveira'),
         ]
 
-        for username, email, first, last in demo_users:
-            u = User.objects.create(
-                username=username,
-                email=email,
-                first_name=first,
-                last_name=last,
-            )
-            users.append(u)
+        bulk_insert(User, ['username', 'email', 'first_name', 'last_name'], demo_users, raw_sql)
+        # recarregar para obter as PKs (nem todo backend as devolve no bulk_create)
+        by_username = User.objects.in_bulk(
+            [username for username, _, _, _ in demo_users], field_name='username'
+        )
+        users = [by_username[username] for username, _, _, _ in demo_users]
 
         self.stdout.write('Criando times e atribuindo membros...')
         team1 = Team.objects.create(name='Team Alpha')
         team2 = Team.objects.create(name='Team Beta')
-        team1.members.add(users[0], users[1])
-        team2.members.add(users[2], users[3])
+        bulk_insert(
+            TEAM_MEMBERS_THROUGH,
+            ['team', 'user'],
+            [
+                (team1.id, users[0].id), (team1.id, users[1].id),
+                (team2.id, users[2].id), (team2.id, users[3].id),
+            ],
+            raw_sql,
+        )
 
         self.stdout.write('Criando workouts sugeridos...')
-        w1 = Workout.objects.create(
-            name='Quick HIIT',
-            description='20-minute high intensity interval training',
-        )
-        w2 = Workout.objects.create(
-            name='Morning Yoga',
-            description='30-minute mobility and stretch flow',
-        )
-        w3 = Workout.objects.create(
-            name='Long Run',
-            description='60-minute steady state run',
-        )
+        demo_workouts = [
+            ('Quick HIIT', '20-minute high intensity interval training'),
+            ('Morning Yoga', '30-minute mobility and stretch flow'),
+            ('Long Run', '60-minute steady state run'),
+        ]
+        last_id = Workout.objects.aggregate(last=Max('id'))['last'] or 0
+        workouts = bulk_insert(Workout, ['name', 'description'], demo_workouts, raw_sql)
+        if not (workouts and connection.features.can_return_rows_from_bulk_insert):
+            # name não é unique: recarregar apenas os workouts criados agora
+            workouts = list(Workout.objects.filter(id__gt=last_id).order_by('id'))
+        w1, w2, w3 = workouts
         # sugerir workouts para usuários
-        w1.suggested_for.add(users[0], users[2])
-        w2.suggested_for.add(users[1], users[3])
-        w3.suggested_for.add(*users)
+        suggestions = [(w1, users[0]), (w1, users[2]), (w2, users[1]), (w2, users[3])]
+        suggestions += [(w3, u) for u in users]
+        bulk_insert(
+            WORKOUT_SUGGESTED_THROUGH,
+            ['workout', 'user'],
+            [(workout.id, user.id) for workout, user in suggestions],
+            raw_sql,
+        )
 
         self.stdout.write('Criando atividades (historico)...')
-        base_date = datetime.now()
-        for i, u in enumerate(users):
-            # criar algumas atividades por usuário
-            for j in range(3):
-                act_date = base_date - timedelta(days=i * 2 + j)
-                duration = 20 + i * 10 + j * 5
-                calories = float(150 + i * 30 + j * 20)
-                Activity.objects.create(
-                    user=u,
-                    activity_type='run' if j % 2 == 0 else 'bike',
-                    duration=duration,
-                    calories_burned=calories,
-                    date=act_date,
-                )
+        rows = build_activity_rows([u.id for u in users], activities_per_user)
+        bulk_insert(
+            Activity,
+            ['user', 'duration', 'calories_burned', 'activity_type'],
+            rows,
+            raw_sql,
+        )
 
         self.stdout.write('Calculando leaderboards por time...')
-        # calcular pontos como soma de calories (arredondada) dos membros
-        for team in Team.objects.all():
-            members = team.members.all()
-            total_points = 0
-            for m in members:
-                agg = Activity.objects.filter(user=m).aggregate(total=Sum('calories_burned'))
-                total_points += int(agg['total'] or 0)
-            Leaderboard.objects.create(team=team, total_points=total_points)
+        refresh_leaderboards()
 
         self.stdout.write(
             self.style.SUCCESS('População de dados de teste concluída.')
@@ -0,0 +1,19 @@
+"""
+Django management command to refresh the precomputed team leaderboard.
+
+Recalcula o snapshot da tabela Leaderboard a partir das atividades (ex.:
+agendado via cron).
+
+Usage:
+  python manage.py refresh_leaderboard
+"""
+from django.core.management.base import BaseCommand
+from octofit_tracker.leaderboard import refresh_leaderboards
+
+
+class Command(BaseCommand):
+    help = 'Refresh the precomputed team leaderboard'
+
+    def handle(self, *args, **options):
+        count = refresh_leaderboards()
+        self.stdout.write(self.style.SUCCESS(f'Leaderboard atualizado ({count} times).'))
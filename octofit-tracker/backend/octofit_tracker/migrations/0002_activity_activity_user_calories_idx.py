@@ -0,0 +1,17 @@
+# Generated by Django 4.1.7 on 2026-10-15 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('octofit_tracker', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['user', 'calories_burned'], name='activity_user_calories_idx'),
+        ),
+    ]
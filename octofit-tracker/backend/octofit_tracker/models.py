@@ -19,6 +19,12 @@ class Activity(models.Model):
     calories_burned = models.FloatField()
     date = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # cobre o SUM(calories_burned) agrupado por usuário do leaderboard
+        indexes = [
+            models.Index(fields=['user', 'calories_burned'], name='activity_user_calories_idx'),
+        ]
+
 class Leaderboard(models.Model):
     team = models.ForeignKey(Team, on_delete=models.CASCADE)
     total_points = models.IntegerField(default=0)
@@ -89,7 +89,10 @@ DATABASES = {
             'username': '',
             'password': '',
             'authSource': 'admin',
-        }
+        },
+        # conexões persistentes: evita reconectar a cada request/comando
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
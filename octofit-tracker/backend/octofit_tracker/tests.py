@@ -1,5 +1,12 @@
+import os
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
+from django.utils import timezone
 from .models import User, Team, Activity, Leaderboard, Workout
+from .leaderboard import refresh_leaderboards
 
 class UserModelTest(TestCase):
     def test_create_user(self):
@@ -7,25 +14,105 @@ class UserModelTest(TestCase):
         self.assertEqual(user.username, 'testuser')
 
 class TeamModelTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='testuser', email='test@example.com', first_name='Test', last_name='User')
+        cls.team = Team.objects.create(name='Team A')
+
     def test_create_team(self):
-        user = User.objects.create(username='testuser', email='test@example.com', first_name='Test', last_name='User')
-        team = Team.objects.create(name='Team A')
-        team.members.add(user)
-        self.assertIn(user, team.members.all())
+        self.team.members.add(self.user)
+        self.assertIn(self.user, self.team.members.all())
 
 class ActivityModelTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='testuser', email='test@example.com', first_name='Test', last_name='User')
+
     def test_create_activity(self):
-        user = User.objects.create(username='testuser', email='test@example.com', first_name='Test', last_name='User')
-        activity = Activity.objects.create(user=user, activity_type='Run', duration=30, calories_burned=300)
+        activity = Activity.objects.create(user=self.user, activity_type='Run', duration=30, calories_burned=300)
         self.assertEqual(activity.activity_type, 'Run')
 
 class LeaderboardModelTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(name='Team A')
+
     def test_create_leaderboard(self):
-        team = Team.objects.create(name='Team A')
-        leaderboard = Leaderboard.objects.create(team=team, total_points=100)
+        leaderboard = Leaderboard.objects.create(team=self.team, total_points=100)
         self.assertEqual(leaderboard.total_points, 100)
 
 class WorkoutModelTest(TestCase):
     def test_create_workout(self):
         workout = Workout.objects.create(name='Cardio', description='Cardio workout')
         self.assertEqual(workout.name, 'Cardio')
+
+class RefreshLeaderboardsTest(TestCase):
+    def test_refresh_leaderboards(self):
+        user = User.objects.create(username='testuser', email='test@example.com', first_name='Test', last_name='User')
+        team = Team.objects.create(name='Team A')
+        team.members.add(user)
+        Activity.objects.create(user=user, activity_type='Run', duration=30, calories_burned=300)
+        Activity.objects.create(user=user, activity_type='Bike', duration=20, calories_burned=150)
+        refresh_leaderboards()
+        refresh_leaderboards()
+        self.assertEqual(Leaderboard.objects.get(team=team).total_points, 450)
+
+    def test_refresh_leaderboards_per_team(self):
+        alice = User.objects.create(username='alice', email='alice@example.com', first_name='Alice', last_name='Silva')
+        bob = User.objects.create(username='bob', email='bob@example.com', first_name='Bob', last_name='Souza')
+        alpha = Team.objects.create(name='Team Alpha')
+        beta = Team.objects.create(name='Team Beta')
+        empty = Team.objects.create(name='Team Empty')
+        alpha.members.add(alice)
+        beta.members.add(bob)
+        Activity.objects.create(user=alice, activity_type='Run', duration=30, calories_burned=300)
+        Activity.objects.create(user=bob, activity_type='Bike', duration=20, calories_burned=120)
+        self.assertEqual(refresh_leaderboards(), 3)
+        totals = dict(Leaderboard.objects.values_list('team__name', 'total_points'))
+        self.assertEqual(totals, {'Team Alpha': 300, 'Team Beta': 120, 'Team Empty': 0})
+
+class PopulateDbCommandTest(TestCase):
+    def populate(self, *args, raw_sql=False, **options):
+        env = {'POPULATE_USE_RAW_SQL': '1' if raw_sql else ''}
+        with mock.patch.dict(os.environ, env):
+            call_command('populate_db', *args, stdout=StringIO(), **options)
+
+    def assert_demo_data(self, started_at):
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Team.members.through.objects.count(), 4)
+        self.assertEqual(Workout.suggested_for.through.objects.count(), 8)
+        self.assertEqual(Activity.objects.count(), 12)
+        totals = dict(Leaderboard.objects.values_list('team__name', 'total_points'))
+        self.assertEqual(totals, {'Team Alpha': 1110, 'Team Beta': 1470})
+        # date é auto_now_add: os dois caminhos gravam o instante do insert
+        for date in Activity.objects.values_list('date', flat=True):
+            self.assertTrue(timezone.is_aware(date))
+            self.assertTrue(started_at <= date <= timezone.now())
+
+    def test_populate_orm(self):
+        started_at = timezone.now()
+        self.populate('--force')
+        self.assert_demo_data(started_at)
+
+    def test_populate_raw_sql(self):
+        started_at = timezone.now()
+        self.populate('--force', raw_sql=True)
+        self.assert_demo_data(started_at)
+
+    def test_populate_force_reseeds(self):
+        self.populate('--force')
+        started_at = timezone.now()
+        self.populate('--force', raw_sql=True)
+        self.assert_demo_data(started_at)
+
+    def test_populate_ignores_leftover_workouts(self):
+        old = Workout.objects.create(name='Quick HIIT', description='old')
+        self.populate()
+        self.assertEqual(old.suggested_for.count(), 0)
+        self.assertEqual(Workout.objects.filter(name='Quick HIIT').exclude(pk=old.pk).get().suggested_for.count(), 2)
+
+    def test_populate_rejects_invalid_activities_per_user(self):
+        self.populate('--force')
+        with self.assertRaises(CommandError):
+            self.populate('--force', activities_per_user=0)
+        self.assertEqual(User.objects.count(), 4)